@@ -18,66 +18,64 @@ Layout matches original schematic:
 """
 
 import bpy
-import math
+import importlib
+import os
+import sys
+import numpy as np
+
+# Shared layout and scene helpers live next to this script; Blender's Text
+# Editor does not put the script's folder on sys.path, and a plain import
+# would keep serving the first-loaded copy on re-runs. There __file__ is
+# "<file>.blend/<text name>", so take the folder from the text's own path
+_text = bpy.data.texts.get(os.path.basename(__file__))
+_script_path = bpy.path.abspath(_text.filepath) if _text and _text.filepath else __file__
+_script_dir = os.path.dirname(os.path.abspath(_script_path))
+if _script_dir not in sys.path:  # Once per session, not once per Run Script
+    sys.path.insert(0, _script_dir)
+import channel_common
+importlib.reload(channel_common)
+from channel_common import (
+    STRUCTURES, STRUCTURE_NAMES, STRUCTURE_POS, STRUCTURE_SIZE, cached_mesh,
+    build_mesh, select_only, get_material, link_objects, create_label,
+    merge_labels, play_action, set_keyframes, keyframe_action, clear_scene,
+    setup_camera, setup_lighting, setup_world,
+)
+
+try:
+    import numba  # Optional - not bundled with Blender
+    prange = numba.prange
+except ImportError:
+    numba = None
+    prange = range
 
 # ============================================================================
-# COLORS
+# TRANSACTION ROUTES
+# Each stop is (structure, x shift, is_unit). Unit stops land inside the
+# structure; the others are entry/exit points above it at ENTRY_Z.
 # ============================================================================
-COLORS = {
-    'wcache': (0.2, 0.9, 0.3, 1.0),          # Green
-    'write_rs': (1.0, 0.5, 0.0, 1.0),        # Orange
-    'read_rs': (0.0, 0.6, 1.0, 1.0),         # Blue
-    'dram': (0.8, 0.2, 0.9, 1.0),            # Purple
-    'read_return': (0.0, 0.9, 0.9, 1.0),     # Cyan
-    'read_ball': (0.0, 0.8, 1.0, 1.0),       # Cyan ball
-    'write_ball': (1.0, 0.5, 0.0, 1.0),      # Orange ball
-}
-
-# ============================================================================
-# 2D SCHEMATIC LAYOUT (Top-down view, all at Y=0.5)
-# Z is vertical in view, X is horizontal
-# ============================================================================
-#
-#                 [WCache]           Z = 6
-#                    |
-#     [Write RS]          [Read RS]  Z = 2  
-#          \                /
-#              [DRAM]                Z = -3
-#                    \
-#                [Read Return]       Z = -3, X = 8
-#
-STRUCTURES = {
-    'wcache': {
-        'pos': (0, 0.5, 6),
-        'size': (4, 1, 2),
-        'color': 'wcache',
-        'label': 'WCache',
-    },
-    'write_rs': {
-        'pos': (-4, 0.5, 2),
-        'size': (3, 1, 2),
-        'color': 'write_rs',
-        'label': 'Write RS',
-    },
-    'read_rs': {
-        'pos': (4, 0.5, 2),
-        'size': (3, 1, 2),
-        'color': 'read_rs',
-        'label': 'Read RS',
-    },
-    'dram': {
-        'pos': (0, 0.5, -3),
-        'size': (6, 1, 2.5),
-        'color': 'dram',
-        'label': 'DRAM',
-    },
-    'read_return': {
-        'pos': (8, 0.5, -3),
-        'size': (3, 1, 2),
-        'color': 'read_return',
-        'label': 'Read Return',
-    },
-}
+ENTRY_Z = 12
+
+# Path: Enter -> WCache -> Write RS -> DRAM
+WRITE_ROUTE = (
+    ('wcache', 0.0, False),       # Enter from top
+    ('wcache', 0.0, True),        # WCache
+    ('write_rs', 0.0, True),      # Write RS
+    ('dram', -1.5, True),         # DRAM (left side)
+)
+
+# Path: Enter -> Read RS -> DRAM -> Read Return -> Exit (upwards)
+READ_ROUTE = (
+    ('read_rs', 0.0, False),      # Enter from top
+    ('read_rs', 0.0, True),       # Read RS
+    ('dram', 1.5, True),          # DRAM (right side)
+    ('read_return', 0.0, True),   # Read Return
+    ('read_return', 0.0, False),  # Exit upwards
+)
+
+# delta_location of the i-th ball on a route (row i % 8), spreading the balls
+# horizontally so they land side by side in each unit
+SLOT_OFFSETS = np.array([(x, 0, 0) for x in (-0.8, -0.3, 0.2, 0.7, -0.5, 0.0, 0.5, 1.0)],
+                        dtype=np.float32)
 
 
 # ============================================================================
@@ -87,248 +85,280 @@ STRUCTURES = {
 USE_PHYSICS = True   # Enable hybrid physics
 FRAMES_IN_UNIT = 60  # Time in units for physics to settle
 FRAMES_TRAVEL = 20   # Travel time between units (keyframed)
+FRAME_END = 600      # Last frame of the animation and of the physics cache
+PREVIEW_QUALITY = False  # Cheaper physics, meshes and renders while iterating
+BAKE_PHYSICS = True  # Bake the rigid body cache once at the end, so scrubbing never re-simulates
+COMPOSITOR_GLOW = False  # Opt-in Fog Glow compositor pass (one extra pass per frame)
+EXPORT_PATHS = None  # .npy file for the sampled (ball, frame, xyz) paths, keyframe mode only
+
+# Ball mesh detail (coarser in preview)
+SPHERE_SUBDIVISIONS = 1 if PREVIEW_QUALITY else 2
+
+# ============================================================================
+# SHARED GEOMETRY
+# ============================================================================
+# Unit cube centered on the origin: 8 corners, 6 outward-facing quads
+UNIT_CUBE_VERTS = np.array([
+    (-0.5, -0.5, -0.5), (0.5, -0.5, -0.5), (0.5, 0.5, -0.5), (-0.5, 0.5, -0.5),
+    (-0.5, -0.5, 0.5), (0.5, -0.5, 0.5), (0.5, 0.5, 0.5), (-0.5, 0.5, 0.5),
+], dtype=np.float32)
+
+UNIT_CUBE_FACES = np.array([
+    (0, 3, 2, 1),  # Bottom (-Z)
+    (4, 5, 6, 7),  # Top (+Z)
+    (0, 1, 5, 4),  # Front (-Y)
+    (2, 3, 7, 6),  # Back (+Y)
+    (1, 2, 6, 5),  # Right (+X)
+    (3, 0, 4, 7),  # Left (-X)
+], dtype=np.int32)
+
+# Floor + 4 walls (everything but the top)
+OPEN_BOX_FACES = [0, 2, 3, 4, 5]
+
+# Unit icosahedron (before normalization), seed for icosphere()
+_T = (1.0 + 5 ** 0.5) / 2
+ICOSAHEDRON_VERTS = np.array([
+    (-1, _T, 0), (1, _T, 0), (-1, -_T, 0), (1, -_T, 0),
+    (0, -1, _T), (0, 1, _T), (0, -1, -_T), (0, 1, -_T),
+    (_T, 0, -1), (_T, 0, 1), (-_T, 0, -1), (-_T, 0, 1),
+], dtype=np.float64)
+
+ICOSAHEDRON_FACES = np.array([
+    (0, 11, 5), (0, 5, 1), (0, 1, 7), (0, 7, 10), (0, 10, 11),
+    (1, 5, 9), (5, 11, 4), (11, 10, 2), (10, 7, 6), (7, 1, 8),
+    (3, 9, 4), (3, 4, 2), (3, 2, 6), (3, 6, 8), (3, 8, 9),
+    (4, 9, 5), (2, 4, 11), (6, 2, 10), (8, 6, 7), (9, 8, 1),
+], dtype=np.int32)
 
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
 
+def jit(func=None, parallel=False):
+    """
+    numba.njit(cache=True) when Numba is installed, else the plain NumPy function.
+    
+    Use as @jit, or @jit(parallel=True) for functions whose outer loop is a prange.
+    Run from the Text Editor the script is not a real file, so Numba has no
+    place for its cache; the compile (seconds) would then be paid on every
+    run for arrays that NumPy handles in well under a millisecond, so those
+    functions stay plain NumPy.
+    """
+    if func is None:
+        return lambda f: jit(f, parallel)
+    if numba is None:
+        return func
+    try:
+        return numba.njit(cache=True, parallel=parallel)(func)
+    except RuntimeError:  # "cannot cache function ...: no locator available"
+        return func
+
+
 def setup_physics_world():
     """Initialize rigid body world for physics simulation."""
     scene = bpy.context.scene
     if scene.rigidbody_world is None:
         bpy.ops.rigidbody.world_add()
-    scene.rigidbody_world.point_cache.frame_end = 600
-
-
-def clear_scene():
-    """Remove everything from scene."""
-    bpy.ops.object.select_all(action='SELECT')
-    bpy.ops.object.delete()
-    for m in bpy.data.materials:
-        bpy.data.materials.remove(m)
-    for mesh in bpy.data.meshes:
-        bpy.data.meshes.remove(mesh)
-
-
-def create_material(name, color, emission=2.0, transparent=False):
-    """Create a glowing material, optionally transparent."""
-    mat = bpy.data.materials.new(name=name)
-    mat.use_nodes = True
-    
-    if transparent:
-        try:
-            mat.blend_method = 'BLEND'
-        except:
-            pass
-    
-    nodes = mat.node_tree.nodes
-    links = mat.node_tree.links
-    nodes.clear()
-    
-    output = nodes.new('ShaderNodeOutputMaterial')
-    
-    if transparent:
-        # Mix emission with transparent for see-through effect
-        mix = nodes.new('ShaderNodeMixShader')
-        mix.inputs[0].default_value = 0.8  # 80% transparent, 20% colored
-        
-        emission_node = nodes.new('ShaderNodeEmission')
-        emission_node.inputs['Color'].default_value = color
-        emission_node.inputs['Strength'].default_value = emission
-        
-        transparent_node = nodes.new('ShaderNodeBsdfTransparent')
-        
-        links.new(transparent_node.outputs['BSDF'], mix.inputs[1])
-        links.new(emission_node.outputs['Emission'], mix.inputs[2])
-        links.new(mix.outputs['Shader'], output.inputs['Surface'])
+    rbw = scene.rigidbody_world
+    rbw.point_cache.frame_end = FRAME_END  # Trimmed to the last ball in create_scene
+    # Set both ways - these persist in the .blend across runs
+    if PREVIEW_QUALITY:
+        # Bake cost scales with substeps x solver iterations per frame
+        rbw.substeps_per_frame = 4
+        rbw.solver_iterations = 8
     else:
-        emission_node = nodes.new('ShaderNodeEmission')
-        emission_node.inputs['Color'].default_value = color
-        emission_node.inputs['Strength'].default_value = emission
-        links.new(emission_node.outputs['Emission'], output.inputs['Surface'])
-    
-    return mat
+        rbw.substeps_per_frame = 10  # Blender's defaults
+        rbw.solver_iterations = 10
+
+
+def bake_physics():
+    """Bake the rigid body cache; on disk too if the .blend has been saved."""
+    point_cache = bpy.context.scene.rigidbody_world.point_cache
+    # Disk caches live next to the .blend, so they need a saved file
+    point_cache.use_disk_cache = bpy.data.is_saved
+    with bpy.context.temp_override(point_cache=point_cache):
+        # clear_scene leaves the world's cache alone, and bake skips a baked
+        # cache - free a previous run's simulation first
+        if point_cache.is_baked:
+            bpy.ops.ptcache.free_bake()
+        bpy.ops.ptcache.bake(bake=True)
+
+
+def get_open_box_mesh():
+    """Shared unit cube without its top face, for collision containers."""
+    return cached_mesh('open_box', lambda: build_mesh(
+        "OpenBox", UNIT_CUBE_VERTS, UNIT_CUBE_FACES[OPEN_BOX_FACES]))
+
+
+def get_box_mesh(size, shrink=1.0):
+    """Shared closed box mesh per structure size (times shrink), size baked in."""
+    def build():
+        verts = UNIT_CUBE_VERTS * np.array(size, dtype=np.float32) * shrink
+        mesh = build_mesh("Box", verts, UNIT_CUBE_FACES)
+        mesh.materials.append(None)  # One slot, filled per object
+        return mesh
+    return cached_mesh(('box', tuple(size), shrink), build)
+
+
+def get_corner_mesh(size):
+    """Shared mesh of the 8 corner spheres of a box per structure size."""
+    def build():
+        corners = UNIT_CUBE_VERTS * np.array(size, dtype=np.float32)
+        # Bare icosahedron: at radius 0.1 a corner is a few pixels on screen
+        sphere_verts, sphere_tris = icosphere(subdivisions=1, radius=0.1)
+        verts = (sphere_verts[None, :, :] + corners[:, None, :]).reshape(-1, 3)
+        offsets = len(sphere_verts) * np.arange(len(corners), dtype=np.int32)
+        tris = (sphere_tris[None, :, :] + offsets[:, None, None]).reshape(-1, 3)
+        mesh = build_mesh("Corners", verts, tris)
+        mesh.materials.append(None)  # One slot, filled per object
+        return mesh
+    return cached_mesh(('corners', tuple(size)), build)
 
 
 def create_box(name, pos, size, color_name):
-    """Create a glowing wireframe container with semi-transparent fill."""
-    color = COLORS[color_name]
+    """
+    Create a glowing wireframe container with semi-transparent fill.
+    
+    Returns (objects, collider): the new data-API objects, not yet linked to
+    the scene (see link_objects), and the collision container (None without
+    physics), which add_container_physics turns into a passive body.
+    """
     sx, sy, sz = size
     px, py, pz = pos
-    hx, hy, hz = sx/2, sy/2, sz/2
-    
-    # 1. Create semi-transparent fill box
-    bpy.ops.mesh.primitive_cube_add(size=1, location=pos)
-    fill_box = bpy.context.active_object
-    fill_box.name = f"{name}_fill"
-    fill_box.scale = (sx * 0.98, sy * 0.98, sz * 0.98)  # Slightly smaller
-    bpy.ops.object.transform_apply(scale=True)
-    
-    # Semi-transparent material (80% transparent)
-    fill_mat = create_material(f"mat_{name}_fill", color, emission=1.0, transparent=True)
-    fill_box.data.materials.append(fill_mat)
-    
-    # Create THICK collision boxes for floor and walls (invisible but solid)
-    # Using cubes instead of planes for reliable collision
+    hz = sz/2
+    
+    # 1. Create semi-transparent fill box (mesh shared by same-sized boxes)
+    fill_box = bpy.data.objects.new(f"{name}_fill", get_box_mesh(size, 0.98))  # Slightly smaller
+    fill_box.location = pos
+    objects = [fill_box]
+    
+    # Semi-transparent material (80% transparent), on the object's slot
+    slot = fill_box.material_slots[0]
+    slot.link = 'OBJECT'
+    slot.material = get_material(color_name, emission=1.0, transparent=True)
+    
+    # Invisible collision container: floor + 4 walls as ONE open-top mesh and
+    # one passive body, instead of five separate boxes/bodies. Open box
+    # spans the inside of the unit, from just above its floor to above its top.
+    container = None
     if USE_PHYSICS:
-        try:
-            wall_thickness = 0.3  # Thick enough to prevent tunneling
-            
-            # Floor (thick box at bottom)
-            floor_z = pz - hz - wall_thickness/2 + 0.05
-            bpy.ops.mesh.primitive_cube_add(size=1, location=(px, py, floor_z))
-            floor = bpy.context.active_object
-            floor.name = f"{name}_floor"
-            floor.scale = (sx + wall_thickness, sy + wall_thickness, wall_thickness)
-            bpy.ops.object.transform_apply(scale=True)
-            floor.hide_render = True
-            floor.display_type = 'BOUNDS'
-            bpy.ops.rigidbody.object_add(type='PASSIVE')
-            floor.rigid_body.collision_shape = 'BOX'
-            floor.rigid_body.friction = 0.9
-            floor.rigid_body.restitution = 0.2
-            floor.rigid_body.collision_margin = 0.0
-            
-            # Left wall
-            bpy.ops.mesh.primitive_cube_add(size=1, location=(px - hx - wall_thickness/2, py, pz))
-            wall = bpy.context.active_object
-            wall.name = f"{name}_wall_left"
-            wall.scale = (wall_thickness, sy + wall_thickness, sz + wall_thickness)
-            bpy.ops.object.transform_apply(scale=True)
-            wall.hide_render = True
-            wall.display_type = 'BOUNDS'
-            bpy.ops.rigidbody.object_add(type='PASSIVE')
-            wall.rigid_body.collision_shape = 'BOX'
-            wall.rigid_body.friction = 0.5
-            wall.rigid_body.restitution = 0.3
-            wall.rigid_body.collision_margin = 0.0
-            
-            # Right wall
-            bpy.ops.mesh.primitive_cube_add(size=1, location=(px + hx + wall_thickness/2, py, pz))
-            wall = bpy.context.active_object
-            wall.name = f"{name}_wall_right"
-            wall.scale = (wall_thickness, sy + wall_thickness, sz + wall_thickness)
-            bpy.ops.object.transform_apply(scale=True)
-            wall.hide_render = True
-            wall.display_type = 'BOUNDS'
-            bpy.ops.rigidbody.object_add(type='PASSIVE')
-            wall.rigid_body.collision_shape = 'BOX'
-            wall.rigid_body.friction = 0.5
-            wall.rigid_body.restitution = 0.3
-            wall.rigid_body.collision_margin = 0.0
-            
-            # Front wall (towards camera - at lower Y)
-            bpy.ops.mesh.primitive_cube_add(size=1, location=(px, py - hy - wall_thickness/2, pz))
-            wall = bpy.context.active_object
-            wall.name = f"{name}_wall_front"
-            wall.scale = (sx + wall_thickness, wall_thickness, sz + wall_thickness)
-            bpy.ops.object.transform_apply(scale=True)
-            wall.hide_render = True
-            wall.display_type = 'BOUNDS'
-            bpy.ops.rigidbody.object_add(type='PASSIVE')
-            wall.rigid_body.collision_shape = 'BOX'
-            wall.rigid_body.friction = 0.5
-            wall.rigid_body.restitution = 0.3
-            wall.rigid_body.collision_margin = 0.0
-            
-            # Back wall (away from camera - at higher Y)
-            bpy.ops.mesh.primitive_cube_add(size=1, location=(px, py + hy + wall_thickness/2, pz))
-            wall = bpy.context.active_object
-            wall.name = f"{name}_wall_back"
-            wall.scale = (sx + wall_thickness, wall_thickness, sz + wall_thickness)
-            bpy.ops.object.transform_apply(scale=True)
-            wall.hide_render = True
-            wall.display_type = 'BOUNDS'
-            bpy.ops.rigidbody.object_add(type='PASSIVE')
-            wall.rigid_body.collision_shape = 'BOX'
-            wall.rigid_body.friction = 0.5
-            wall.rigid_body.restitution = 0.3
-            wall.rigid_body.collision_margin = 0.0
-            
-        except Exception as e:
-            print(f"Physics setup failed for {name}: {e}")
-    
-    # 2. Create glowing wireframe edges
-    corners = [
-        (px-hx, py-hy, pz-hz), (px+hx, py-hy, pz-hz),
-        (px+hx, py-hy, pz+hz), (px-hx, py-hy, pz+hz),
-        (px-hx, py+hy, pz-hz), (px+hx, py+hy, pz-hz),
-        (px+hx, py+hy, pz+hz), (px-hx, py+hy, pz+hz),
-    ]
-    
-    edges = [
-        (0,1), (1,2), (2,3), (3,0),  # Bottom
-        (4,5), (5,6), (6,7), (7,4),  # Top
-        (0,4), (1,5), (2,6), (3,7),  # Verticals
-    ]
-    
-    edge_mat = create_material(f"mat_{name}_edge", color, emission=6.0)
-    
-    for i, (a, b) in enumerate(edges):
-        p1, p2 = corners[a], corners[b]
-        mid = ((p1[0]+p2[0])/2, (p1[1]+p2[1])/2, (p1[2]+p2[2])/2)
-        dx, dy, dz = p2[0]-p1[0], p2[1]-p1[1], p2[2]-p1[2]
-        length = (dx**2 + dy**2 + dz**2) ** 0.5
-        
-        bpy.ops.mesh.primitive_cylinder_add(radius=0.06, depth=length, location=mid)
-        edge_obj = bpy.context.active_object
-        edge_obj.name = f"{name}_edge_{i}"
-        
-        from mathutils import Vector
-        direction = Vector((dx, dy, dz)).normalized()
-        up = Vector((0, 0, 1))
-        if abs(direction.dot(up)) < 0.999:
-            rot_axis = up.cross(direction).normalized()
-            rot_angle = math.acos(direction.dot(up))
-            edge_obj.rotation_mode = 'AXIS_ANGLE'
-            edge_obj.rotation_axis_angle = (rot_angle, rot_axis.x, rot_axis.y, rot_axis.z)
-        elif direction.z < 0:
-            edge_obj.rotation_euler = (math.radians(180), 0, 0)
+        floor_z = pz - hz + 0.05
+        top_z = pz + hz + 0.15
+        container = bpy.data.objects.new(f"{name}_collider", get_open_box_mesh())
+        container.location = (px, py, (floor_z + top_z) / 2)
+        container.scale = (sx, sy, top_z - floor_z)
+        container.hide_render = True
+        container.display_type = 'WIRE'
+        objects.append(container)
+    
+    # 2. Create glowing wireframe edges: the box's own 12 edges, thickened
+    # into struts by a Wireframe modifier (evaluated once, the box is static)
+    edge_mat = get_material(color_name, emission=6.0)
+    edge_obj = bpy.data.objects.new(f"{name}_edges", get_box_mesh(size))
+    edge_obj.location = pos
+    wire = edge_obj.modifiers.new("Wireframe", 'WIREFRAME')
+    wire.thickness = 0.12
+    wire.offset = 0.0  # Centered on the edges
+    wire.use_even_offset = True
+    slot = edge_obj.material_slots[0]
+    slot.link = 'OBJECT'
+    slot.material = edge_mat
+    objects.append(edge_obj)
+    
+    # 3. Corner spheres - all 8 in one mesh, shared by same-sized boxes
+    corner_obj = bpy.data.objects.new(f"{name}_corners", get_corner_mesh(size))
+    corner_obj.location = pos
+    slot = corner_obj.material_slots[0]
+    slot.link = 'OBJECT'
+    slot.material = edge_mat
+    objects.append(corner_obj)
+    
+    return objects, container
+
+
+def add_container_physics(containers):
+    """Make all collision containers passive rigid bodies in one operator call."""
+    try:
+        select_only(containers)
+        bpy.ops.rigidbody.objects_add(type='PASSIVE')
         
-        edge_obj.data.materials.append(edge_mat)
-    
-    # 3. Corner spheres
-    for i, corner in enumerate(corners):
-        bpy.ops.mesh.primitive_uv_sphere_add(radius=0.1, location=corner)
-        sphere = bpy.context.active_object
-        sphere.name = f"{name}_corner_{i}"
-        sphere.data.materials.append(edge_mat)
+        for obj in containers:
+            obj.rigid_body.collision_shape = 'MESH'
+            obj.rigid_body.friction = 0.9
+            obj.rigid_body.restitution = 0.2
+            # Faces have no thickness - the margin keeps balls from tunneling
+            obj.rigid_body.collision_margin = 0.04
+    except Exception as e:
+        print(f"Physics setup failed for containers: {e}")
+
+
+def icosphere(subdivisions, radius):
+    """
+    Icosphere vertices (N, 3) and triangles (M, 3) as NumPy arrays.
     
-    return fill_box
+    subdivisions follows bmesh.ops.create_icosphere: 1 is the bare
+    icosahedron (12 verts), 2 gives 42 verts, and so on.
+    """
+    verts = ICOSAHEDRON_VERTS / np.linalg.norm(ICOSAHEDRON_VERTS, axis=1, keepdims=True)
+    faces = ICOSAHEDRON_FACES
+    for _ in range(subdivisions - 1):
+        # Split every triangle in 4, adding one vertex per unique edge
+        edges = np.sort(faces[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2), axis=1)
+        unique, inverse = np.unique(edges, axis=0, return_inverse=True)
+        ab, bc, ca = (len(verts) + inverse.reshape(-1, 3)).T
+        mids = verts[unique].mean(axis=1)
+        verts = np.vstack([verts, mids / np.linalg.norm(mids, axis=1, keepdims=True)])
+        a, b, c = faces.T
+        faces = np.concatenate([
+            np.stack([a, ab, ca], axis=1), np.stack([b, bc, ab], axis=1),
+            np.stack([c, ca, bc], axis=1), np.stack([ab, bc, ca], axis=1),
+        ])
+    return (verts * radius).astype(np.float32), faces.astype(np.int32)
+
+
+def get_ball_mesh():
+    """Shared smooth-shaded icosphere for every transaction ball."""
+    def build():
+        # Icosphere (42 verts, 12 in preview) instead of a 32x16 UV sphere - the collider is
+        # an analytic SPHERE either way, so this only trims render mesh traffic
+        verts, faces = icosphere(SPHERE_SUBDIVISIONS, radius=0.35)
+        mesh = build_mesh("BallMesh", verts, faces)
+        mesh.polygons.foreach_set("use_smooth", np.ones(len(faces), dtype=bool))
+        mesh.materials.append(None)  # One slot, filled per object
+        return mesh
+    return cached_mesh('ball', build)
 
 
-def create_label(text, pos):
-    """Create a text label visible from top-down camera."""
-    bpy.ops.object.text_add(location=pos)
-    obj = bpy.context.active_object
-    obj.data.body = text
-    obj.data.size = 0.5
-    obj.data.align_x = 'CENTER'
-    obj.data.align_y = 'CENTER'
-    # Lie flat, rotated to read correctly from camera at +Y looking down
-    obj.rotation_euler = (math.radians(-90), math.radians(180), 0)
+def create_ball(name, color_name, pos):
+    """
+    Create a transaction ball, not yet linked to the scene.
+    
+    create_scene links all balls at once (link_objects) and then gives them
+    physics in one go (add_ball_physics).
+    """
+    obj = bpy.data.objects.new(name, get_ball_mesh())
+    obj.location = pos
     
-    mat = create_material(f"mat_label_{text}", (1, 1, 0.9, 1), emission=10.0)
-    obj.data.materials.append(mat)
+    # The mesh is shared by all balls, so color lives on the object's slot
+    slot = obj.material_slots[0]
+    slot.link = 'OBJECT'
+    slot.material = get_material(color_name, emission=8.0)
     
     return obj
 
 
-def create_ball(name, color_name, pos):
-    """Create a transaction ball with optional physics."""
-    bpy.ops.mesh.primitive_uv_sphere_add(radius=0.35, location=pos)
-    obj = bpy.context.active_object
-    obj.name = name
-    bpy.ops.object.shade_smooth()
-    
-    color = COLORS[color_name]
-    mat = create_material(f"mat_{name}", color, emission=8.0)
-    obj.data.materials.append(mat)
+def add_ball_physics(balls):
+    """
+    Add rigid bodies to all balls in a single operator call.
     
-    # Add rigid body for physics
-    if USE_PHYSICS:
-        try:
-            bpy.ops.rigidbody.object_add(type='ACTIVE')
+    Adding them one by one rebuilds the Bullet world once per ball;
+    rigidbody.objects_add works on the whole selection and rebuilds it once.
+    """
+    try:
+        select_only(balls)
+        bpy.ops.rigidbody.objects_add(type='ACTIVE')
+        
+        for obj in balls:
             obj.rigid_body.collision_shape = 'SPHERE'
             obj.rigid_body.mass = 0.5
             obj.rigid_body.friction = 0.8
@@ -336,17 +366,47 @@ def create_ball(name, color_name, pos):
             obj.rigid_body.linear_damping = 0.5  # Settle quickly
             obj.rigid_body.angular_damping = 0.5
             obj.rigid_body.collision_margin = 0.04
+            # Let settled balls drop out of the simulation island until
+            # something hits them (kinematic phases re-activate them)
+            obj.rigid_body.use_deactivation = True
+            obj.rigid_body.deactivate_linear_velocity = 0.1
+            obj.rigid_body.deactivate_angular_velocity = 0.2
             # CRITICAL: Start kinematic so it follows keyframes initially
+            # (hybrid_action keyframes this at frame 1)
             obj.rigid_body.kinematic = True
-            # Set initial keyframe to ensure kinematic from frame 1
-            obj.keyframe_insert(data_path="rigid_body.kinematic", frame=1)
-        except:
-            pass
-    
-    return obj
+    except Exception as e:
+        print(f"Physics setup failed for balls: {e}")
 
 
-def animate_ball_hybrid(ball, waypoints, start_frame):
+@jit
+def hybrid_schedule(is_unit, start_frame, frames_in_unit, frames_travel):
+    """
+    Keyframe timeline for hybrid_action.
+    
+    Returns (arrivals, kin_frames, kin_values): the arrival frame at each
+    waypoint, and the frames/values of the kinematic switches.
+    """
+    # A unit holds the ball for frames_in_unit (physics), a travel stop for
+    # frames_travel (pure keyframe motion)
+    durations = np.where(is_unit, frames_in_unit, frames_travel)
+    arrivals = np.empty(len(is_unit), dtype=np.int64)
+    arrivals[0] = start_frame
+    arrivals[1:] = start_frame + np.cumsum(durations[:-1])
+    
+    # Kinematic True at frame 1, then for every unit hand off to physics
+    # 2 frames after arrival and take back 2 frames before leaving.
+    # No location keyframes inside a unit - the ball is free to bounce/settle.
+    unit_arrivals = arrivals[is_unit]
+    kin_frames = np.empty(1 + 2 * len(unit_arrivals), dtype=np.int64)
+    kin_frames[0] = 1
+    kin_frames[1::2] = unit_arrivals + 2
+    kin_frames[2::2] = unit_arrivals + frames_in_unit - 2
+    kin_values = np.ones(len(kin_frames), dtype=np.int64)
+    kin_values[1::2] = 0
+    return arrivals, kin_frames, kin_values
+
+
+def hybrid_action(name, waypoints):
     """
     Hybrid animation based on Blender best practices:
     - Keyframes ONLY for travel between units (kinematic=True)
@@ -354,141 +414,133 @@ def animate_ball_hybrid(ball, waypoints, start_frame):
     
     waypoints: list of (position, is_unit) tuples
                is_unit=True means physics takes over here
+    
+    The kinematic channel uses CONSTANT interpolation, so it is only
+    keyframed where the value actually flips; the frame-1 key holds it True
+    through every travel segment.
+    
+    Returns a new action starting at frame 1, for play_action.
     """
-    frame = start_frame
+    positions = np.array([pos for pos, _ in waypoints], dtype=np.float32)
+    is_unit = np.array([unit for _, unit in waypoints], dtype=np.bool_)
+    arrivals, kin_frames, kin_values = hybrid_schedule(
+        is_unit, 1, FRAMES_IN_UNIT, FRAMES_TRAVEL)
     
-    # Ensure ball starts kinematic at frame 1
-    if ball.rigid_body:
-        ball.rigid_body.kinematic = True
-        ball.keyframe_insert(data_path="rigid_body.kinematic", frame=1)
+    action = bpy.data.actions.new(name)
+    # LINEAR for locations (smoother handoff to physics)
+    set_keyframes(action, "location", arrivals, positions, 'LINEAR')
+    # CONSTANT for boolean switches
+    set_keyframes(action, "rigid_body.kinematic", kin_frames, kin_values, 'CONSTANT')
+    return action
+
+
+@jit(parallel=True)
+def sample_paths(key_frames, key_locs, start_frames, offsets, n_frames):
+    """
+    Positions of N balls at scene frames 1..n_frames, as an (N, n_frames, 3) array.
     
-    for i, (pos, is_unit) in enumerate(waypoints):
-        
-        if is_unit:
-            # === ENTERING A UNIT ===
-            # 1. Set position keyframe at arrival (still kinematic)
-            ball.location = pos
-            ball.keyframe_insert(data_path="location", frame=frame)
-            
-            if ball.rigid_body:
-                # 2. Stay kinematic at arrival frame
-                ball.rigid_body.kinematic = True
-                ball.keyframe_insert(data_path="rigid_body.kinematic", frame=frame)
-                
-                # 3. Switch to physics 2 frames later (smooth handoff)
-                ball.rigid_body.kinematic = False
-                ball.keyframe_insert(data_path="rigid_body.kinematic", frame=frame + 2)
-                
-                # 4. Physics runs for FRAMES_IN_UNIT - NO location keyframes during this!
-                # The ball is free to bounce/settle
-                
-                # 5. Before next waypoint, switch back to kinematic
-                exit_frame = frame + FRAMES_IN_UNIT
-                ball.rigid_body.kinematic = True
-                ball.keyframe_insert(data_path="rigid_body.kinematic", frame=exit_frame - 2)
-            
-            frame += FRAMES_IN_UNIT
-            
-        else:
-            # === TRAVELING BETWEEN UNITS ===
-            # Pure keyframe motion - kinematic stays True
-            ball.location = pos
-            ball.keyframe_insert(data_path="location", frame=frame)
-            
-            if ball.rigid_body:
-                ball.rigid_body.kinematic = True
-                ball.keyframe_insert(data_path="rigid_body.kinematic", frame=frame)
-            
-            frame += FRAMES_TRAVEL
-    
-    # Set interpolation modes
+    key_frames/key_locs: the (K,) frames and (K, 3) locations of a shared
+    route action (starting at frame 1); ball b plays it from start_frames[b]
+    shifted by offsets[b], like play_action + delta_location.
+    Segments are eased like BEZIER keys with flat handles.
+    """
+    n_balls = len(start_frames)
+    n_keys = len(key_frames)
+    out = np.empty((n_balls, n_frames, 3), dtype=np.float32)
+    for b in prange(n_balls):
+        k = 0
+        for f in range(n_frames):
+            t = f + 2 - start_frames[b]  # Action-local frame
+            while k < n_keys - 2 and t >= key_frames[k + 1]:
+                k += 1
+            u = (t - key_frames[k]) / (key_frames[k + 1] - key_frames[k])
+            u = min(max(u, 0.0), 1.0)
+            u = u * u * (3.0 - 2.0 * u)
+            for axis in range(3):
+                out[b, f, axis] = (key_locs[k, axis] + u * (key_locs[k + 1, axis] - key_locs[k, axis])
+                                   + offsets[b, axis])
+    return out
+
+
+def action_location_keys(action):
+    """(K,) frames and (K, 3) values of an action's location keyframes."""
+    fcurves = sorted((fc for fc in action.fcurves if fc.data_path == "location"),
+                     key=lambda fc: fc.array_index)
+    n_keys = len(fcurves[0].keyframe_points)
+    co = np.empty((3, n_keys, 2), dtype=np.float32)
+    for axis, fc in enumerate(fcurves):
+        fc.keyframe_points.foreach_get("co", co[axis].ravel())
+    return co[0, :, 0].copy(), np.ascontiguousarray(co[:, :, 1].T)
+
+
+def sample_transactions(transactions, n_frames):
+    """Sample every (ball, action, start_frame) path, one sample_paths call per action."""
+    paths = np.empty((len(transactions), n_frames, 3), dtype=np.float32)
+    for action in {action for _, action, _ in transactions}:
+        rows = [i for i, (_, a, _) in enumerate(transactions) if a == action]
+        key_frames, key_locs = action_location_keys(action)
+        starts = np.array([transactions[i][2] for i in rows], dtype=np.float32)
+        offsets = np.array([transactions[i][0].delta_location for i in rows], dtype=np.float32)
+        paths[rows] = sample_paths(key_frames, key_locs, starts, offsets, n_frames)
+    return paths
+
+
+def setup_render_settings():
+    """EEVEE render settings."""
+    scene = bpy.context.scene
     try:
-        if ball.animation_data and ball.animation_data.action:
-            fcurves = getattr(ball.animation_data.action, 'fcurves', None)
-            if fcurves:
-                for fc in fcurves:
-                    for kf in fc.keyframe_points:
-                        if 'location' in fc.data_path:
-                            # LINEAR for locations (smoother handoff to physics)
-                            kf.interpolation = 'LINEAR'
-                        elif 'kinematic' in fc.data_path:
-                            # CONSTANT for boolean switches
-                            kf.interpolation = 'CONSTANT'
-    except:
-        pass
-
-
-def animate_ball(ball, waypoints, start_frame, frames_per_stop=30, add_bounce=True):
+        scene.render.engine = 'BLENDER_EEVEE_NEXT'  # Blender 4.2 - 4.4
+    except TypeError:
+        scene.render.engine = 'BLENDER_EEVEE'
+    scene.frame_end = FRAME_END
+    # Set both ways - these persist in the .blend across runs
+    if PREVIEW_QUALITY:
+        scene.render.resolution_percentage = 50
+        scene.eevee.taa_render_samples = 16
+        # Render every other frame - plenty to judge the motion. The rigid
+        # body solver only steps frame by frame, so live (unbaked) physics
+        # needs every frame
+        scene.frame_step = 2 if BAKE_PHYSICS or not USE_PHYSICS else 1
+    else:
+        scene.render.resolution_percentage = 100
+        scene.eevee.taa_render_samples = 64  # Blender's default
+        scene.frame_step = 1
+    # Keep render data (BVH, shaders) alive between frames of an animation
+    # render - only the balls move, so everything else can be reused
+    scene.render.use_persistent_data = True
+    if COMPOSITOR_GLOW:
+        # Glow comes from one compositor pass, not EEVEE's per-frame bloom
+        # (legacy EEVEE only - EEVEE Next has no bloom)
+        if hasattr(scene.eevee, 'use_bloom'):
+            scene.eevee.use_bloom = False
+        setup_compositor()
+
+
+def setup_compositor():
     """
-    Simple keyframe animation with optional bounce effect.
+    Render Layers -> Fog Glow -> Composite: the neon glow on emissive parts.
     
-    add_bounce: if True, adds a small settling bounce when arriving at each stop
+    Only replaces the default Render Layers -> Composite tree; any other
+    tree (the user's, or this one from a previous run) is left as it is.
     """
-    frame = start_frame
+    scene = bpy.context.scene
+    scene.use_nodes = True
+    nodes = scene.node_tree.nodes
+    if any(node.type not in ('R_LAYERS', 'COMPOSITE') for node in nodes):
+        return
+    nodes.clear()  # Only the default Render Layers -> Composite
     
-    for i, pos in enumerate(waypoints):
-        # Arrive at position
-        ball.location = pos
-        ball.keyframe_insert(data_path="location", frame=frame)
-        
-        # Add bounce effect (except for first and last waypoint)
-        if add_bounce and i > 0 and i < len(waypoints) - 1:
-            # Small bounce up
-            bounce_height = 0.3
-            ball.location = (pos[0], pos[1], pos[2] + bounce_height)
-            ball.keyframe_insert(data_path="location", frame=frame + 4)
-            
-            # Settle back down
-            ball.location = pos
-            ball.keyframe_insert(data_path="location", frame=frame + 8)
-            
-            # Tiny secondary bounce
-            ball.location = (pos[0], pos[1], pos[2] + bounce_height * 0.3)
-            ball.keyframe_insert(data_path="location", frame=frame + 11)
-            
-            # Final settle
-            ball.location = pos
-            ball.keyframe_insert(data_path="location", frame=frame + 14)
-        
-        frame += frames_per_stop
+    render_layers = nodes.new('CompositorNodeRLayers')
+    glare = nodes.new('CompositorNodeGlare')
+    glare.glare_type = 'FOG_GLOW'
+    glare.size = 7
+    glare.threshold = 0.8  # Only the emissive edges/balls are this bright
+    glare.mix = 0.0        # Even mix of image and glow
+    composite = nodes.new('CompositorNodeComposite')
     
-    try:
-        if ball.animation_data and ball.animation_data.action:
-            fcurves = getattr(ball.animation_data.action, 'fcurves', None)
-            if fcurves:
-                for fc in fcurves:
-                    for kf in fc.keyframe_points:
-                        kf.interpolation = 'BEZIER'
-    except:
-        pass
-
-
-def setup_camera():
-    """Top-down camera."""
-    bpy.ops.object.camera_add(location=(0, 20, 0))
-    cam = bpy.context.active_object
-    cam.rotation_euler = (math.radians(90), 0, 0)
-    cam.data.lens = 25
-    bpy.context.scene.camera = cam
-
-
-def setup_lighting():
-    """Simple lighting."""
-    bpy.ops.object.light_add(type='SUN', location=(0, 10, 5))
-    light = bpy.context.active_object
-    light.data.energy = 3
-
-
-def setup_world():
-    """Dark background."""
-    world = bpy.context.scene.world
-    if not world:
-        world = bpy.data.worlds.new("World")
-        bpy.context.scene.world = world
-    world.use_nodes = True
-    bg = world.node_tree.nodes.get('Background')
-    if bg:
-        bg.inputs['Color'].default_value = (0.02, 0.02, 0.05, 1)
+    links = scene.node_tree.links
+    links.new(render_layers.outputs['Image'], glare.inputs['Image'])
+    links.new(glare.outputs['Image'], composite.inputs['Image'])
 
 
 # ============================================================================
@@ -500,9 +552,10 @@ def create_scene():
     print(f"USE_PHYSICS = {USE_PHYSICS}")
     
     clear_scene()
+    # Engine first, so materials are only ever compiled for EEVEE
+    setup_render_settings()
     setup_world()
-    setup_camera()
-    setup_lighting()
+    pending = [setup_camera(), setup_lighting()]  # Data-API objects, linked in one pass below
     
     # Set up physics world
     if USE_PHYSICS:
@@ -510,95 +563,99 @@ def create_scene():
     
     # Create all structure boxes (these become collision objects)
     print("Creating structures...")
+    containers = []
+    labels = []
     for name, cfg in STRUCTURES.items():
-        create_box(name, cfg['pos'], cfg['size'], cfg['color'])
+        objects, container = create_box(name, cfg['pos'], cfg['size'], cfg['color'])
+        pending.extend(objects)
+        if container is not None:
+            containers.append(container)
         label_pos = (cfg['pos'][0], cfg['pos'][1] + 0.6, cfg['pos'][2])
-        create_label(cfg['label'], label_pos)
+        labels.append(create_label(cfg['label'], label_pos))
+    merge_labels(labels)
     
     # Create animated transactions
     print("Creating transactions...")
     
-    # Unit positions - balls arrive at TOP of unit (higher Z), then fall when physics kicks in
-    # Structure sizes from STRUCTURES dict: (X, Y, Z) where Z is height
-    # Arrival Z = center_z + half_height - small offset
-    
-    def get_unit_top(unit_name):
-        """Get position at top of unit for ball arrival."""
-        cfg = STRUCTURES[unit_name]
-        cx, cy, cz = cfg['pos']
-        half_h = cfg['size'][2] / 2
-        return (cx, cy, cz + half_h - 0.3)  # Slightly below top edge
+    # Unit stops - with physics, balls arrive at TOP of unit (higher Z), then
+    # fall when physics kicks in; pure keyframes park them at the unit center.
+    # Structure sizes are (X, Y, Z) where Z is height
+    stops = STRUCTURE_POS.copy()
+    if USE_PHYSICS:
+        stops[:, 2] += STRUCTURE_SIZE[:, 2] / 2 - 0.3  # Slightly below top edge
+    unit_stops = dict(zip(STRUCTURE_NAMES, stops.tolist()))
+    
+    def route_waypoints(route):
+        """Resolve a route spec into (position, is_unit) waypoints."""
+        waypoints = []
+        for unit_name, dx, is_unit in route:
+            cx, cy, cz = unit_stops[unit_name]
+            z = cz if is_unit else ENTRY_Z
+            waypoints.append(((cx + dx, cy, z), is_unit))
+        return waypoints
+    
+    # Every ball on a route shares the route's one action: the NLA strip
+    # staggers its start, delta_location shifts it into its slot
+    write_waypoints = route_waypoints(WRITE_ROUTE)
+    read_waypoints = route_waypoints(READ_ROUTE)
+    if USE_PHYSICS:
+        write_action = hybrid_action("write_route", write_waypoints)
+        read_action = hybrid_action("read_route", read_waypoints)
+    else:
+        write_action = keyframe_action(
+            "write_route", [pos for pos, _ in write_waypoints], frames_per_stop=40)
+        read_action = keyframe_action(
+            "read_route", [pos for pos, _ in read_waypoints], frames_per_stop=45)
     
-    wcache_top = get_unit_top('wcache')
-    write_rs_top = get_unit_top('write_rs')
-    read_rs_top = get_unit_top('read_rs')
-    dram_top = get_unit_top('dram')
-    read_return_top = get_unit_top('read_return')
+    transactions = []  # (ball, action, start_frame)
     
-    def get_slot_offset(slot_index):
-        """Get X offset for ball slot - spread balls horizontally."""
-        offsets = [-0.8, -0.3, 0.2, 0.7, -0.5, 0.0, 0.5, 1.0]
-        return offsets[slot_index % len(offsets)]
+    # Stagger starts (physics needs longer gaps for balls to settle)
+    num_writes = 6
+    num_reads = 6
+    if USE_PHYSICS:
+        write_starts = range(1, 1 + num_writes * 50, 50)
+        read_starts = range(10, 10 + num_reads * 50, 50)
+    else:
+        write_starts = range(1, 1 + num_writes * 25, 25)
+        read_starts = range(10, 10 + num_reads * 30, 30)
     
     # WRITE transactions (6 balls)
-    # Path: Enter -> WCache -> Write RS -> DRAM
-    num_writes = 6
-    for i in range(num_writes):
-        x_off = get_slot_offset(i)
-        
-        if USE_PHYSICS:
-            waypoints = [
-                ((0 + x_off, 0.5, 12), False),  # Enter from top
-                ((wcache_top[0] + x_off, wcache_top[1], wcache_top[2]), True),  # WCache
-                ((write_rs_top[0] + x_off, write_rs_top[1], write_rs_top[2]), True),  # Write RS
-                ((dram_top[0] - 1.5 + x_off, dram_top[1], dram_top[2]), True),  # DRAM
-            ]
-            ball = create_ball(f"write_{i}", "write_ball", waypoints[0][0])
-            start = 1 + i * 50  # Stagger starts
-            animate_ball_hybrid(ball, waypoints, start_frame=start)
-        else:
-            waypoints = [
-                (0 + x_off, 0.5, 12),
-                (STRUCTURES['wcache']['pos'][0] + x_off, 0.5, STRUCTURES['wcache']['pos'][2]),
-                (STRUCTURES['write_rs']['pos'][0] + x_off, 0.5, STRUCTURES['write_rs']['pos'][2]),
-                (STRUCTURES['dram']['pos'][0] - 1.5 + x_off, 0.5, STRUCTURES['dram']['pos'][2]),
-            ]
-            ball = create_ball(f"write_{i}", "write_ball", waypoints[0])
-            start = 1 + i * 25
-            animate_ball(ball, waypoints, start_frame=start, frames_per_stop=40)
+    for i, start in enumerate(write_starts):
+        ball = create_ball(f"write_{i}", "write_ball", write_waypoints[0][0])
+        ball.delta_location = SLOT_OFFSETS[i % len(SLOT_OFFSETS)]
+        transactions.append((ball, write_action, start))
     
     # READ transactions (6 balls)
-    # Path: Enter -> Read RS -> DRAM -> Read Return -> Exit (upwards)
-    num_reads = 6
-    for i in range(num_reads):
-        x_off = get_slot_offset(i)
-        
-        if USE_PHYSICS:
-            waypoints = [
-                ((4 + x_off, 0.5, 12), False),  # Enter from top
-                ((read_rs_top[0] + x_off, read_rs_top[1], read_rs_top[2]), True),  # Read RS
-                ((dram_top[0] + 1.5 + x_off, dram_top[1], dram_top[2]), True),  # DRAM
-                ((read_return_top[0] + x_off, read_return_top[1], read_return_top[2]), True),  # Read Return
-                ((read_return_top[0] + x_off, 0.5, 12), False),  # Exit upwards
-            ]
-            ball = create_ball(f"read_{i}", "read_ball", waypoints[0][0])
-            start = 10 + i * 50
-            animate_ball_hybrid(ball, waypoints, start_frame=start)
-        else:
-            waypoints = [
-                (4 + x_off, 0.5, 12),
-                (STRUCTURES['read_rs']['pos'][0] + x_off, 0.5, STRUCTURES['read_rs']['pos'][2]),
-                (STRUCTURES['dram']['pos'][0] + 1.5 + x_off, 0.5, STRUCTURES['dram']['pos'][2]),
-                (STRUCTURES['read_return']['pos'][0] + x_off, 0.5, STRUCTURES['read_return']['pos'][2]),
-                (STRUCTURES['read_return']['pos'][0] + x_off, 0.5, 12),
-            ]
-            ball = create_ball(f"read_{i}", "read_ball", waypoints[0])
-            start = 10 + i * 30
-            animate_ball(ball, waypoints, start_frame=start, frames_per_stop=45)
-    
-    # Render settings
-    bpy.context.scene.render.engine = 'BLENDER_EEVEE'
-    bpy.context.scene.frame_end = 600
+    for i, start in enumerate(read_starts):
+        ball = create_ball(f"read_{i}", "read_ball", read_waypoints[0][0])
+        ball.delta_location = SLOT_OFFSETS[i % len(SLOT_OFFSETS)]
+        transactions.append((ball, read_action, start))
+    
+    balls = [ball for ball, _, _ in transactions]
+    link_objects(pending + balls)
+    
+    # Register containers and balls with the rigid body world, one pass each
+    if USE_PHYSICS:
+        add_container_physics(containers)
+        add_ball_physics(balls)
+    
+    for ball, action, start in transactions:
+        play_action(ball, action, start)
+    
+    if USE_PHYSICS:
+        # Nothing is simulated after the last ball's final key (its last
+        # switch back to kinematic) - don't bake the frames after it
+        last_frame = max(start + int(action.frame_range[1]) - 1 for _, action, start in transactions)
+        bpy.context.scene.rigidbody_world.point_cache.frame_end = min(FRAME_END, last_frame)
+    
+    if USE_PHYSICS and BAKE_PHYSICS:
+        print("Baking physics...")
+        bake_physics()
+    
+    if EXPORT_PATHS and not USE_PHYSICS:
+        # Physics paths only exist once the cache is baked
+        np.save(EXPORT_PATHS, sample_transactions(transactions, bpy.context.scene.frame_end))
+        print(f"Ball paths saved to {EXPORT_PATHS}")
     
     print("=" * 50)
     if USE_PHYSICS:
@@ -0,0 +1,349 @@
+"""
+Memory Channel Visualizer - Shared Blender Helpers
+===================================================
+
+Layout, colors and scene plumbing shared by both Blender scene scripts:
+
+- blender_channel_scene.py                  (hybrid physics)
+- blender_channel_scene_backup_nophysics.py (pure keyframes)
+
+Meshes and materials are cached here, so both scripts reuse the same
+datablocks within a run; clear_scene resets the caches.
+"""
+
+import bpy
+import math
+import numpy as np
+
+# ============================================================================
+# COLORS
+# ============================================================================
+COLORS = {
+    'wcache': (0.2, 0.9, 0.3, 1.0),          # Green
+    'write_rs': (1.0, 0.5, 0.0, 1.0),        # Orange
+    'read_rs': (0.0, 0.6, 1.0, 1.0),         # Blue
+    'dram': (0.8, 0.2, 0.9, 1.0),            # Purple
+    'read_return': (0.0, 0.9, 0.9, 1.0),     # Cyan
+    'read_ball': (0.0, 0.8, 1.0, 1.0),       # Cyan ball
+    'write_ball': (1.0, 0.5, 0.0, 1.0),      # Orange ball
+    'label': (1.0, 1.0, 0.9, 1.0),           # Warm white text
+}
+
+# float32 buffers for node default_value assignments
+COLORS_NP = {name: np.array(rgba, dtype=np.float32) for name, rgba in COLORS.items()}
+
+# ============================================================================
+# 2D SCHEMATIC LAYOUT (Top-down view, all at Y=0.5)
+# Z is vertical in view, X is horizontal
+# ============================================================================
+#
+#                 [WCache]           Z = 6
+#                    |
+#     [Write RS]          [Read RS]  Z = 2  
+#          \                /
+#              [DRAM]                Z = -3
+#                    \
+#                [Read Return]       Z = -3, X = 8
+#
+STRUCTURES = {
+    'wcache': {
+        'pos': (0, 0.5, 6),
+        'size': (4, 1, 2),
+        'color': 'wcache',
+        'label': 'WCache',
+    },
+    'write_rs': {
+        'pos': (-4, 0.5, 2),
+        'size': (3, 1, 2),
+        'color': 'write_rs',
+        'label': 'Write RS',
+    },
+    'read_rs': {
+        'pos': (4, 0.5, 2),
+        'size': (3, 1, 2),
+        'color': 'read_rs',
+        'label': 'Read RS',
+    },
+    'dram': {
+        'pos': (0, 0.5, -3),
+        'size': (6, 1, 2.5),
+        'color': 'dram',
+        'label': 'DRAM',
+    },
+    'read_return': {
+        'pos': (8, 0.5, -3),
+        'size': (3, 1, 2),
+        'color': 'read_return',
+        'label': 'Read Return',
+    },
+}
+
+# The same layout as arrays (one row per structure, in STRUCTURES order),
+# for vectorized math over all structures at once
+STRUCTURE_NAMES = tuple(STRUCTURES)
+STRUCTURE_POS = np.array([STRUCTURES[n]['pos'] for n in STRUCTURE_NAMES], dtype=np.float32)
+STRUCTURE_SIZE = np.array([STRUCTURES[n]['size'] for n in STRUCTURE_NAMES], dtype=np.float32)
+
+# ============================================================================
+# ANIMATION
+# ============================================================================
+# Keyframe.interpolation enum values, for foreach_set
+KEYFRAME_INTERPOLATION = {'CONSTANT': 0, 'LINEAR': 1, 'BEZIER': 2}
+
+# Arrival bounce for keyframe_action: frame offsets after arrival and the lift
+# (in bounce heights) at each - up, settle, tiny secondary bounce, settle
+BOUNCE_FRAMES = np.array([0, 4, 8, 11, 14])
+BOUNCE_LIFT = np.array([0.0, 1.0, 0.0, 0.3, 0.0], dtype=np.float32)
+
+# Meshes and materials shared between objects (reset by clear_scene)
+_MESH_CACHE = {}
+_MAT_CACHE = {}
+
+# ============================================================================
+# HELPER FUNCTIONS
+# ============================================================================
+
+def clear_scene():
+    """Remove everything from scene."""
+    # One batch_remove instead of a select/delete pass plus a remove() per
+    # datablock. It covers every ID type the scripts create, so there is
+    # nothing left for an orphan purge (which would also sweep the user's
+    # own unused datablocks)
+    bpy.data.batch_remove(
+        list(bpy.data.objects) + list(bpy.data.meshes) + list(bpy.data.materials)
+        + list(bpy.data.curves) + list(bpy.data.cameras) + list(bpy.data.lights)
+        + list(bpy.data.actions))
+    _MESH_CACHE.clear()
+    _MAT_CACHE.clear()
+
+
+def select_only(objects):
+    """Select exactly these objects (first one active) for bulk operators."""
+    for obj in bpy.context.selected_objects:
+        obj.select_set(False)
+    for obj in objects:
+        obj.select_set(True)
+    bpy.context.view_layer.objects.active = objects[0]
+
+
+def build_mesh(name, verts, faces):
+    """Build a mesh straight from NumPy vertex (N, 3) and face (M, k) arrays."""
+    n_faces, face_size = faces.shape
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(len(verts))
+    mesh.vertices.foreach_set("co", verts.ravel())
+    mesh.loops.add(faces.size)
+    mesh.loops.foreach_set("vertex_index", faces.ravel())
+    mesh.polygons.add(n_faces)
+    mesh.polygons.foreach_set("loop_start", np.arange(0, faces.size, face_size, dtype=np.int32))
+    try:
+        mesh.polygons.foreach_set("loop_total", np.full(n_faces, face_size, dtype=np.int32))
+    except Exception:
+        pass  # Read-only in newer Blender (derived from loop_start)
+    mesh.update(calc_edges=True)
+    return mesh
+
+
+def create_material(name, color, emission=2.0, transparent=False):
+    """Create a glowing material, optionally transparent."""
+    mat = bpy.data.materials.new(name=name)
+    mat.use_nodes = True
+    
+    if transparent:
+        try:
+            mat.blend_method = 'BLEND'
+        except:
+            pass
+    
+    nodes = mat.node_tree.nodes
+    nodes.clear()
+    new_node = nodes.new
+    new_link = mat.node_tree.links.new
+    
+    output = new_node('ShaderNodeOutputMaterial')
+    
+    if transparent:
+        # One Principled BSDF: emission only, at 20% alpha (80% transparent)
+        bsdf = new_node('ShaderNodeBsdfPrincipled')
+        bsdf_in = bsdf.inputs
+        bsdf_in['Base Color'].default_value = (0, 0, 0, 1)
+        # Socket names changed in Blender 4.0
+        (bsdf_in.get('Emission Color') or bsdf_in['Emission']).default_value = color
+        bsdf_in['Emission Strength'].default_value = emission
+        (bsdf_in.get('Specular IOR Level') or bsdf_in['Specular']).default_value = 0.0
+        bsdf_in['Alpha'].default_value = 0.2
+        new_link(bsdf.outputs['BSDF'], output.inputs['Surface'])
+    else:
+        emission_node = new_node('ShaderNodeEmission')
+        emission_in = emission_node.inputs
+        emission_in['Color'].default_value = color
+        emission_in['Strength'].default_value = emission
+        new_link(emission_node.outputs['Emission'], output.inputs['Surface'])
+    
+    return mat
+
+
+def cached_mesh(key, build):
+    """Mesh shared between objects: build() on first use, then reused until clear_scene."""
+    mesh = _MESH_CACHE.get(key)
+    if mesh is None:
+        mesh = _MESH_CACHE[key] = build()
+    return mesh
+
+
+def get_material(color_name, emission=2.0, transparent=False):
+    """Shared material for a COLORS entry, built on first use."""
+    key = (color_name, emission, transparent)
+    mat = _MAT_CACHE.get(key)
+    if mat is None:
+        name = f"mat_{color_name}_fill" if transparent else f"mat_{color_name}"
+        # clear_scene removed the previous run's materials, so a taken name
+        # is this color at another emission - name that one by its strength
+        if name in bpy.data.materials:
+            name = f"{name}_{emission:g}"
+        mat = create_material(name, COLORS_NP[color_name], emission, transparent)
+        _MAT_CACHE[key] = mat
+    return mat
+
+
+def link_objects(objects):
+    """Link data-API objects to the scene in one pass, then update once."""
+    link = bpy.context.collection.objects.link
+    for obj in objects:
+        link(obj)
+    bpy.context.view_layer.update()
+
+
+def create_label(text, pos):
+    """Create a text label visible from top-down camera (returned unlinked)."""
+    curve = bpy.data.curves.new(text, type='FONT')
+    curve.body = text
+    curve.size = 0.5
+    curve.align_x = 'CENTER'
+    curve.align_y = 'CENTER'
+    # Glyph outlines are tessellated at this many segments per curve span
+    # (default 12); labels are small on screen, so a coarse outline reads fine
+    curve.resolution_u = 2
+    obj = bpy.data.objects.new(text, curve)
+    obj.location = pos
+    # Lie flat, rotated to read correctly from camera at +Y looking down
+    obj.rotation_euler = (math.radians(-90), math.radians(180), 0)
+    
+    obj.data.materials.append(get_material('label', emission=10.0))
+    
+    return obj
+
+
+def merge_labels(labels):
+    """
+    Turn the static text labels into one mesh object.
+    
+    Font objects re-evaluate their text on every depsgraph update; as a single
+    mesh they are one drawable with the one shared label material.
+    
+    labels: unlinked label objects from create_label.
+    """
+    link_objects(labels)
+    select_only(labels)
+    bpy.ops.object.convert(target='MESH')
+    bpy.ops.object.join()
+    merged = bpy.context.view_layer.objects.active
+    merged.name = "labels"
+    return merged
+
+
+def play_action(obj, action, start_frame):
+    """
+    Play a (shared) action on obj as an NLA strip starting at start_frame.
+    
+    Actions are built from frame 1; the strip shifts them in time, so every
+    ball on a route can reuse that route's one action.
+    """
+    obj.animation_data_create()
+    track = obj.animation_data.nla_tracks.new()
+    track.strips.new(action.name, int(start_frame), action)
+
+
+def set_keyframes(action, data_path, frames, values, interpolation):
+    """
+    Bulk-load keyframes with foreach_set instead of one keyframe_insert each.
+    
+    frames: K keyframe frames (ascending)
+    values: K values, or K rows of per-axis values - column i goes to
+            array index i of data_path
+    """
+    n_keys = len(frames)
+    values = np.asarray(values, dtype=np.float32).reshape(n_keys, -1)
+    co = np.empty((n_keys, 2), dtype=np.float32)
+    co[:, 0] = frames
+    interp = np.full(n_keys, KEYFRAME_INTERPOLATION[interpolation], dtype=np.int32)
+    
+    for index in range(values.shape[1]):
+        fc = action.fcurves.new(data_path, index=index)
+        fc.keyframe_points.add(n_keys)
+        co[:, 1] = values[:, index]
+        fc.keyframe_points.foreach_set("co", co.ravel())
+        fc.keyframe_points.foreach_set("interpolation", interp)
+        fc.update()
+
+
+def keyframe_action(name, waypoints, frames_per_stop=30, add_bounce=True):
+    """
+    Simple keyframe animation with optional bounce effect.
+    
+    add_bounce: if True, adds a small settling bounce when arriving at each stop
+    
+    Returns a new action starting at frame 1, for play_action.
+    """
+    bounce_height = 0.3
+    positions = np.array(waypoints, dtype=np.float32)
+    n_stops = len(positions)
+    
+    # One row per stop: arrival key followed by the bounce pattern's keys
+    frames = 1 + np.arange(n_stops)[:, None] * frames_per_stop + BOUNCE_FRAMES
+    locs = np.repeat(positions[:, None, :], len(BOUNCE_FRAMES), axis=1)
+    locs[:, :, 2] += BOUNCE_LIFT * bounce_height
+    
+    # Bounce everywhere except the first and last waypoint
+    keep = np.ones(frames.shape, dtype=bool)
+    if add_bounce:
+        keep[[0, -1], 1:] = False
+    else:
+        keep[:, 1:] = False
+    frames, locs = frames[keep], locs[keep]
+    
+    action = bpy.data.actions.new(name)
+    set_keyframes(action, "location", frames, locs, 'BEZIER')
+    return action
+
+
+def setup_camera():
+    """Top-down camera (returned unlinked, see link_objects)."""
+    cam_data = bpy.data.cameras.new("Camera")
+    cam_data.lens = 25
+    cam = bpy.data.objects.new("Camera", cam_data)
+    cam.location = (0, 20, 0)
+    cam.rotation_euler = (math.radians(90), 0, 0)
+    bpy.context.scene.camera = cam
+    return cam
+
+
+def setup_lighting():
+    """Simple lighting (returned unlinked, see link_objects)."""
+    sun = bpy.data.lights.new("Sun", type='SUN')
+    sun.energy = 3
+    light = bpy.data.objects.new("Sun", sun)
+    light.location = (0, 10, 5)
+    return light
+
+
+def setup_world():
+    """Dark background."""
+    world = bpy.context.scene.world
+    if not world:
+        world = bpy.data.worlds.new("World")
+        bpy.context.scene.world = world
+    world.use_nodes = True
+    bg = world.node_tree.nodes.get('Background')
+    if bg:
+        bg.inputs['Color'].default_value = (0.02, 0.02, 0.05, 1)
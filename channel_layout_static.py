@@ -9,17 +9,16 @@ might be difficult to install.
 Usage:
     python3 channel_layout_static.py
     
-This will display the layout and save it as channel_layout.png
+This will save the layout as channel_layout.svg
 """
 
-# Use non-interactive backend for headless environments
-import matplotlib
-matplotlib.use('Agg')
-
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
-from matplotlib.patches import FancyBboxPatch, FancyArrowPatch
-import matplotlib.patheffects as path_effects
+# Draw straight onto an SVG canvas - headless, no rasterization, and no
+# pyplot figure manager or backend selection for a one-shot script
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_svg import FigureCanvasSVG
+from matplotlib.transforms import Bbox
+from matplotlib.patches import BoxStyle, FancyBboxPatch
+from matplotlib.collections import LineCollection, PatchCollection, PolyCollection
 import numpy as np
 
 # ============================================================================
@@ -30,6 +29,10 @@ import numpy as np
 FIG_WIDTH = 14
 FIG_HEIGHT = 10
 
+# Top of the axes (figure fraction); the strip above holds the request
+# labels that sit above y=100
+AXES_TOP = 0.98
+
 # Colors
 COLORS = {
     'background': '#141923',        # Dark blue-gray
@@ -81,13 +84,21 @@ STRUCTURES = {
 # Boundary line y-position
 BOUNDARY_Y = 38
 
+# Rounded box styles, built once instead of parsed from a string per patch
+_BOX_STYLE = BoxStyle("round", pad=0.02, rounding_size=1.5)
+_LEGEND_BOX_STYLE = BoxStyle("round", pad=0.01, rounding_size=0.5)
+
 
 # ============================================================================
 # Drawing Functions
 # ============================================================================
 
 def create_structure_box(ax, config):
-    """Create a rounded rectangle for a structure."""
+    """
+    Label a structure and return its rounded rectangle.
+    
+    The box is not added to ax; main draws all boxes as one PatchCollection.
+    """
     x = config['x']
     y = config['y']
     width = config['width']
@@ -99,29 +110,26 @@ def create_structure_box(ax, config):
     # Create rounded rectangle
     box = FancyBboxPatch(
         (x, y), width, height,
-        boxstyle="round,pad=0.02,rounding_size=1.5",
+        boxstyle=_BOX_STYLE,
         facecolor=color,
         edgecolor='white',
         linewidth=2,
         alpha=0.85
     )
-    ax.add_patch(box)
     
-    # Add main label
-    text = ax.text(
+    # Add main label - plain text, the saturated box colors keep the white
+    # labels readable without a stroke path effect (a second draw per text)
+    ax.text(
         x + width/2, y + height/2 + 1,
         label,
         fontsize=14, fontweight='bold',
         color='white',
         ha='center', va='center'
     )
-    text.set_path_effects([
-        path_effects.withStroke(linewidth=2, foreground='black')
-    ])
     
     # Add sublabel
     if sublabel:
-        subtext = ax.text(
+        ax.text(
             x + width/2, y + height/2 - 3,
             sublabel,
             fontsize=9,
@@ -129,22 +137,38 @@ def create_structure_box(ax, config):
             alpha=0.8,
             ha='center', va='center'
         )
-        subtext.set_path_effects([
-            path_effects.withStroke(linewidth=1, foreground='black')
-        ])
+    
+    return box
 
 
-def draw_arrow(ax, start, end, color=COLORS['arrow'], style='simple'):
-    """Draw an arrow between two points."""
-    arrow = FancyArrowPatch(
-        start, end,
-        arrowstyle='-|>',
-        mutation_scale=15,
-        color=color,
-        linewidth=2,
-        alpha=0.7
-    )
-    ax.add_patch(arrow)
+def add_arrows(ax, starts, ends, colors, head_length=1.3, head_width=1.1, shrink=0.4):
+    """
+    Draw straight arrows start -> end as one LineCollection of shafts and one
+    PolyCollection of triangular heads.
+    
+    starts, ends: (N, 2) arrays in data coordinates
+    shrink: tips stop this far short of end (~3 points here, like
+            FancyArrowPatch's shrinkB), clear of the box outlines drawn above
+    """
+    starts = np.asarray(starts, dtype=float)
+    ends = np.asarray(ends, dtype=float)
+    
+    # Unit direction and its normal for every arrow at once
+    direction = ends - starts
+    direction /= np.hypot(direction[:, 0], direction[:, 1])[:, None]
+    normal = np.stack([-direction[:, 1], direction[:, 0]], axis=1)
+    
+    # Shafts stop at the base of the heads, heads end just short of the target
+    ends = ends - shrink * direction
+    base = ends - head_length * direction
+    shafts = np.stack([starts, base], axis=1)
+    heads = np.stack([ends,
+                      base + normal * head_width / 2,
+                      base - normal * head_width / 2], axis=1)
+    
+    ax.add_collection(LineCollection(shafts, colors=colors, linewidths=2, alpha=0.7))
+    ax.add_collection(PolyCollection(heads, facecolors=colors, edgecolors=colors,
+                                     linewidths=1, alpha=0.7))
 
 
 def draw_boundary_line(ax):
@@ -167,25 +191,20 @@ def draw_flow_arrows(ax):
     dram = STRUCTURES['dram']
     read_return = STRUCTURES['read_return']
     
-    # WCache to Write RS
-    start = (wcache['x'] + wcache['width']/3, wcache['y'])
-    end = (write_rs['x'] + write_rs['width']/2, write_rs['y'] + write_rs['height'])
-    draw_arrow(ax, start, end, COLORS['wcache'])
-    
-    # Write RS to DRAM
-    start = (write_rs['x'] + write_rs['width']/2, write_rs['y'])
-    end = (dram['x'] + dram['width']/3, dram['y'] + dram['height'])
-    draw_arrow(ax, start, end, COLORS['write_rs'])
-    
-    # Read RS to DRAM
-    start = (read_rs['x'] + read_rs['width']/2, read_rs['y'])
-    end = (dram['x'] + 2*dram['width']/3, dram['y'] + dram['height'])
-    draw_arrow(ax, start, end, COLORS['read_rs'])
-    
-    # DRAM to Read Return
-    start = (dram['x'] + dram['width'], dram['y'] + dram['height']/2)
-    end = (read_return['x'], read_return['y'] + read_return['height']/2)
-    draw_arrow(ax, start, end, COLORS['read_return'])
+    starts = [
+        (wcache['x'] + wcache['width']/3, wcache['y']),                 # WCache to Write RS
+        (write_rs['x'] + write_rs['width']/2, write_rs['y']),           # Write RS to DRAM
+        (read_rs['x'] + read_rs['width']/2, read_rs['y']),              # Read RS to DRAM
+        (dram['x'] + dram['width'], dram['y'] + dram['height']/2),      # DRAM to Read Return
+    ]
+    ends = [
+        (write_rs['x'] + write_rs['width']/2, write_rs['y'] + write_rs['height']),
+        (dram['x'] + dram['width']/3, dram['y'] + dram['height']),
+        (dram['x'] + 2*dram['width']/3, dram['y'] + dram['height']),
+        (read_return['x'], read_return['y'] + read_return['height']/2),
+    ]
+    colors = [COLORS['wcache'], COLORS['write_rs'], COLORS['read_rs'], COLORS['read_return']]
+    add_arrows(ax, starts, ends, colors)
 
 
 def draw_input_arrows(ax):
@@ -230,7 +249,7 @@ def draw_legend(ax):
         x = 5 + i * 20
         box = FancyBboxPatch(
             (x, y), 3, 2,
-            boxstyle="round,pad=0.01,rounding_size=0.5",
+            boxstyle=_LEGEND_BOX_STYLE,
             facecolor=color,
             edgecolor='white',
             linewidth=1
@@ -245,7 +264,9 @@ def draw_legend(ax):
 
 def main():
     # Create figure
-    fig, ax = plt.subplots(1, 1, figsize=(FIG_WIDTH, FIG_HEIGHT))
+    fig = Figure(figsize=(FIG_WIDTH, FIG_HEIGHT))
+    FigureCanvasSVG(fig)
+    ax = fig.add_subplot(1, 1, 1)
     
     # Set background color
     fig.patch.set_facecolor(COLORS['background'])
@@ -271,24 +292,27 @@ def main():
     # Draw input/output arrows
     draw_input_arrows(ax)
     
-    # Draw all structures
-    for name, config in STRUCTURES.items():
-        create_structure_box(ax, config)
+    # Draw all structures, boxes as one collection (above the flow arrows)
+    boxes = [create_structure_box(ax, config) for config in STRUCTURES.values()]
+    ax.add_collection(PatchCollection(boxes, match_original=True, zorder=2))
     
     # Draw legend
     draw_legend(ax)
     
-    # Adjust layout
-    plt.tight_layout()
+    # Fixed layout - the axes fill the figure (equal aspect centers them
+    # horizontally). No tight_layout/tight bbox, each of which is an extra
+    # draw pass
+    fig.subplots_adjust(left=0, right=1, bottom=0, top=AXES_TOP)
     
-    # Save to file
-    output_file = 'channel_layout.png'
-    plt.savefig(output_file, facecolor=COLORS['background'], 
-                edgecolor='none', dpi=150, bbox_inches='tight')
-    print(f"Saved layout to {output_file}")
+    # Crop to the square axes column, known without measuring any artists
+    side = FIG_HEIGHT * AXES_TOP
+    crop = Bbox.from_bounds((FIG_WIDTH - side) / 2, 0, side, FIG_HEIGHT)
     
-    # Close the figure to free memory
-    plt.close(fig)
+    # Save to file - vector output, so no pixel buffer to fill or compress
+    output_file = 'channel_layout.svg'
+    fig.savefig(output_file, bbox_inches=crop,
+                facecolor=COLORS['background'], edgecolor='none')
+    print(f"Saved layout to {output_file}")
 
 
 if __name__ == "__main__":
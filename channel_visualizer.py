@@ -16,8 +16,10 @@ Layout:
             └─────────────┘         └──────────┘
 """
 
+import numpy as np
 import pygame
 import sys
+from collections import namedtuple
 
 # ============================================================================
 # Configuration
@@ -28,6 +30,14 @@ WINDOW_WIDTH = 1200
 WINDOW_HEIGHT = 900
 WINDOW_TITLE = "Memory Channel Visualizer"
 
+# Font sizes (pygame's bundled default font)
+FONT_SIZES = {
+    'title': 36,
+    'large': 32,
+    'small': 24,
+    'legend': 22,
+}
+
 # Colors (RGB)
 COLORS = {
     'background': (20, 25, 35),        # Dark blue-gray
@@ -93,13 +103,33 @@ STRUCTURES = {
     },
 }
 
+# The same structures as immutable records, for attribute access
+Box = namedtuple('Box', 'x y width height color label sublabel')
+STRUCTURE_BOXES = {name: Box(**config) for name, config in STRUCTURES.items()}
+
 # Boundary line position (y-coordinate)
 BOUNDARY_Y = 430
 
+# Rendered text surfaces, keyed by (font, text, color) - see render_text
+_TEXT_CACHE = {}
+
+# Pre-drawn dashed boundary strips, keyed by window width - see draw_boundary_line
+_DASH_CACHE = {}
+
 # ============================================================================
 # Drawing Functions
 # ============================================================================
 
+def render_text(font, text, color):
+    """Anti-aliased font.render, rendered once per (font, text, color)."""
+    key = (font, text, color)
+    surface = _TEXT_CACHE.get(key)
+    if surface is None:
+        surface = font.render(text, True, color)
+        _TEXT_CACHE[key] = surface
+    return surface
+
+
 def draw_rounded_rect(surface, color, rect, border_radius=10, border_color=None, border_width=2):
     """Draw a rounded rectangle with optional border."""
     x, y, width, height = rect
@@ -112,120 +142,103 @@ def draw_rounded_rect(surface, color, rect, border_radius=10, border_color=None,
         pygame.draw.rect(surface, border_color, rect, width=border_width, border_radius=border_radius)
 
 
-def draw_structure(surface, font_large, font_small, name, config):
-    """Draw a single structure box with label."""
-    x = config['x']
-    y = config['y']
-    width = config['width']
-    height = config['height']
-    color = config['color']
-    label = config['label']
-    sublabel = config.get('sublabel', '')
-    
-    # Draw the box with slightly transparent fill
-    # Create a semi-transparent surface
-    box_surface = pygame.Surface((width, height), pygame.SRCALPHA)
+def blend(color, alpha, background=COLORS['background']):
+    """Opaque color of color drawn at alpha (0-255) over background."""
+    return tuple((c * alpha + bg * (255 - alpha)) // 255 for c, bg in zip(color, background))
+
+
+def draw_structure(surface, font_large, font_small, name, box):
+    """Draw a single structure Box with label."""
+    x, y, width, height, color, label, sublabel = box
     
-    # Fill with semi-transparent color
-    fill_color = (*color, 180)  # Add alpha
-    pygame.draw.rect(box_surface, fill_color, (0, 0, width, height), border_radius=12)
+    # Draw the box with slightly transparent fill - the background under a
+    # box is the plain, known background color, so the 180-alpha fill is
+    # blended ahead of time and drawn opaque, without an alpha surface
+    rect = (x, y, width, height)
+    pygame.draw.rect(surface, blend(color, 180), rect, border_radius=12)
     
     # Draw border
     border_color = tuple(min(c + 50, 255) for c in color)
-    pygame.draw.rect(box_surface, border_color, (0, 0, width, height), width=3, border_radius=12)
-    
-    # Blit to main surface
-    surface.blit(box_surface, (x, y))
+    pygame.draw.rect(surface, border_color, rect, width=3, border_radius=12)
     
     # Draw label (centered)
-    label_surface = font_large.render(label, True, COLORS['text'])
+    label_surface = render_text(font_large, label, COLORS['text'])
     label_rect = label_surface.get_rect(center=(x + width // 2, y + height // 2 - 10))
     surface.blit(label_surface, label_rect)
     
     # Draw sublabel if present
     if sublabel:
-        sublabel_surface = font_small.render(sublabel, True, (*COLORS['text'][:3], 180))
+        sublabel_surface = render_text(font_small, sublabel, (*COLORS['text'][:3], 180))
         sublabel_rect = sublabel_surface.get_rect(center=(x + width // 2, y + height // 2 + 20))
         surface.blit(sublabel_surface, sublabel_rect)
 
 
-def draw_boundary_line(surface, y, width):
+def draw_boundary_line(surface, font, y, width):
     """Draw the boundary line between row sorters and DRAM."""
-    # Draw dashed line
-    dash_length = 20
-    gap_length = 10
-    x = 100
-    end_x = width - 100
-    
-    while x < end_x:
-        pygame.draw.line(
-            surface, 
-            COLORS['boundary_line'], 
-            (x, y), 
-            (min(x + dash_length, end_x), y), 
-            2
-        )
-        x += dash_length + gap_length
+    # Draw dashed line: the dash pattern is drawn once into a 2 px tall
+    # strip, then the whole line is a single blit
+    strip = _DASH_CACHE.get(width)
+    if strip is None:
+        dash_length = 20
+        gap_length = 10
+        length = width - 200
+        
+        strip = pygame.Surface((length + 1, 2), pygame.SRCALPHA)
+        for x in range(0, length, dash_length + gap_length):
+            # Same pixels as a 2 px draw.line over [x, x + dash_length]
+            strip.fill(COLORS['boundary_line'], (x, 0, min(dash_length, length - x) + 1, 2))
+        _DASH_CACHE[width] = strip
+    surface.blit(strip, (100, y))
     
     # Draw label
-    font = pygame.font.Font(None, 24)
-    label = font.render("── Interface Boundary ──", True, COLORS['boundary_line'])
+    label = render_text(font, "── Interface Boundary ──", COLORS['boundary_line'])
     label_rect = label.get_rect(center=(width // 2, y - 15))
     surface.blit(label, label_rect)
 
 
 def draw_flow_arrows(surface):
     """Draw arrows indicating transaction flow."""
-    arrow_color = (100, 110, 130)
-    
-    # Helper to draw an arrow
-    def draw_arrow(start, end, color=arrow_color):
-        pygame.draw.line(surface, color, start, end, 2)
-        # Arrowhead
-        import math
-        angle = math.atan2(end[1] - start[1], end[0] - start[0])
-        arrow_size = 10
-        arrow_angle = math.pi / 6
-        
-        left = (
-            end[0] - arrow_size * math.cos(angle - arrow_angle),
-            end[1] - arrow_size * math.sin(angle - arrow_angle)
-        )
-        right = (
-            end[0] - arrow_size * math.cos(angle + arrow_angle),
-            end[1] - arrow_size * math.sin(angle + arrow_angle)
-        )
-        pygame.draw.polygon(surface, color, [end, left, right])
-    
-    # WCache to Write RS
-    wcache = STRUCTURES['wcache']
-    write_rs = STRUCTURES['write_rs']
-    start = (wcache['x'] + wcache['width'] // 3, wcache['y'] + wcache['height'])
-    end = (write_rs['x'] + write_rs['width'] // 2, write_rs['y'])
-    draw_arrow(start, end, COLORS['wcache'])
+    wcache = STRUCTURE_BOXES['wcache']
+    write_rs = STRUCTURE_BOXES['write_rs']
+    read_rs = STRUCTURE_BOXES['read_rs']
+    dram = STRUCTURE_BOXES['dram']
+    read_return = STRUCTURE_BOXES['read_return']
     
-    # Write RS to DRAM
-    dram = STRUCTURES['dram']
-    start = (write_rs['x'] + write_rs['width'] // 2, write_rs['y'] + write_rs['height'])
-    end = (dram['x'] + dram['width'] // 3, dram['y'])
-    draw_arrow(start, end, COLORS['write_rs'])
+    # One row per arrow: WCache -> Write RS, Write RS -> DRAM,
+    # Read RS -> DRAM, DRAM -> Read Return
+    starts = np.array([
+        (wcache.x + wcache.width // 3, wcache.y + wcache.height),
+        (write_rs.x + write_rs.width // 2, write_rs.y + write_rs.height),
+        (read_rs.x + read_rs.width // 2, read_rs.y + read_rs.height),
+        (dram.x + dram.width, dram.y + dram.height // 2),
+    ])
+    ends = np.array([
+        (write_rs.x + write_rs.width // 2, write_rs.y),
+        (dram.x + dram.width // 3, dram.y),
+        (dram.x + 2 * dram.width // 3, dram.y),
+        (read_return.x, read_return.y + read_return.height // 2),
+    ])
+    colors = [COLORS['wcache'], COLORS['write_rs'], COLORS['read_rs'], COLORS['dram']]
     
-    # Read RS to DRAM
-    read_rs = STRUCTURES['read_rs']
-    start = (read_rs['x'] + read_rs['width'] // 2, read_rs['y'] + read_rs['height'])
-    end = (dram['x'] + 2 * dram['width'] // 3, dram['y'])
-    draw_arrow(start, end, COLORS['read_rs'])
+    # Arrowhead corners for all arrows at once
+    arrow_size = 10
+    arrow_angle = np.pi / 6
+    dx, dy = (ends - starts).T
+    angle = np.arctan2(dy, dx)
+    left = ends - arrow_size * np.stack(
+        [np.cos(angle - arrow_angle), np.sin(angle - arrow_angle)], axis=1)
+    right = ends - arrow_size * np.stack(
+        [np.cos(angle + arrow_angle), np.sin(angle + arrow_angle)], axis=1)
     
-    # DRAM to Read Return
-    read_return = STRUCTURES['read_return']
-    start = (dram['x'] + dram['width'], dram['y'] + dram['height'] // 2)
-    end = (read_return['x'], read_return['y'] + read_return['height'] // 2)
-    draw_arrow(start, end, COLORS['dram'])
+    for start, end, l, r, color in zip(starts.tolist(), ends.tolist(),
+                                       left.tolist(), right.tolist(), colors):
+        pygame.draw.line(surface, color, start, end, 2)
+        pygame.draw.polygon(surface, color, [end, l, r])
 
 
 def draw_title(surface, font):
     """Draw the title at the top."""
-    title = font.render("Memory Channel Transaction Flow", True, COLORS['text'])
+    title = render_text(font, "Memory Channel Transaction Flow", COLORS['text'])
     title_rect = title.get_rect(center=(WINDOW_WIDTH // 2, 25))
     surface.blit(title, title_rect)
 
@@ -247,10 +260,41 @@ def draw_legend(surface, font):
         # Draw color box
         pygame.draw.rect(surface, color, (x, legend_y, 20, 20), border_radius=4)
         # Draw label
-        text = font.render(label, True, COLORS['text'])
+        text = render_text(font, label, COLORS['text'])
         surface.blit(text, (x + 30, legend_y + 2))
 
 
+def build_scene(size, font_title, font_large, font_small, font_legend):
+    """
+    Draw the whole (static) layout once onto its own surface.
+    
+    Nothing in the layout changes between frames, so the main loop only
+    blits this surface instead of redrawing every structure and text.
+    """
+    scene = pygame.Surface(size)
+    
+    # Clear screen
+    scene.fill(COLORS['background'])
+    
+    # Draw title
+    draw_title(scene, font_title)
+    
+    # Draw flow arrows (behind structures)
+    draw_flow_arrows(scene)
+    
+    # Draw boundary line
+    draw_boundary_line(scene, font_small, BOUNDARY_Y, size[0])
+    
+    # Draw all structures
+    for name, box in STRUCTURE_BOXES.items():
+        draw_structure(scene, font_large, font_small, name, box)
+    
+    # Draw legend
+    draw_legend(scene, font_legend)
+    
+    return scene
+
+
 # ============================================================================
 # Main
 # ============================================================================
@@ -260,67 +304,54 @@ def main():
     pygame.init()
     
     # Create window
-    screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+    # SCALED goes through SDL's GPU renderer, which can present vsynced;
+    # not every driver allows vsync, so fall back to a plain window
+    try:
+        screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT),
+                                         pygame.SCALED | pygame.DOUBLEBUF, vsync=1)
+    except pygame.error:
+        screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
     pygame.display.set_caption(WINDOW_TITLE)
     
-    # Fonts
-    try:
-        font_title = pygame.font.Font(None, 36)
-        font_large = pygame.font.Font(None, 32)
-        font_small = pygame.font.Font(None, 24)
-        font_legend = pygame.font.Font(None, 22)
-    except:
-        font_title = pygame.font.SysFont('arial', 28)
-        font_large = pygame.font.SysFont('arial', 24)
-        font_small = pygame.font.SysFont('arial', 18)
-        font_legend = pygame.font.SysFont('arial', 16)
+    # Fonts - the default font ships inside pygame itself, so there is no
+    # system font lookup to fall back from
+    fonts = {role: pygame.font.Font(None, size) for role, size in FONT_SIZES.items()}
+    font_title = fonts['title']
+    font_large = fonts['large']
+    font_small = fonts['small']
+    font_legend = fonts['legend']
     
-    # Clock for controlling frame rate
-    clock = pygame.time.Clock()
+    # Render the layout and instructions once
+    scene = build_scene((WINDOW_WIDTH, WINDOW_HEIGHT),
+                        font_title, font_large, font_small, font_legend)
+    instructions = render_text(font_small, "Press 'S' to save screenshot, 'ESC' to quit", (100, 110, 130))
     
-    # Main loop
+    # Main loop - event driven: the layout is static, so the window is only
+    # redrawn when it is first shown or exposed again, and the loop sleeps
+    # in event.wait() in between
     running = True
+    dirty = True
     while running:
+        if dirty:
+            # Static layout, then the instructions on top
+            screen.blit(scene, (0, 0))
+            screen.blit(instructions, (WINDOW_WIDTH - 350, WINDOW_HEIGHT - 30))
+            pygame.display.flip()
+            dirty = False
+        
         # Handle events
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
+        event = pygame.event.wait()
+        if event.type == pygame.QUIT:
+            running = False
+        elif event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_ESCAPE:
                 running = False
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
-                    running = False
-                elif event.key == pygame.K_s:
-                    # Save screenshot
-                    pygame.image.save(screen, "channel_layout.png")
-                    print("Screenshot saved as channel_layout.png")
-        
-        # Clear screen
-        screen.fill(COLORS['background'])
-        
-        # Draw title
-        draw_title(screen, font_title)
-        
-        # Draw flow arrows (behind structures)
-        draw_flow_arrows(screen)
-        
-        # Draw boundary line
-        draw_boundary_line(screen, BOUNDARY_Y, WINDOW_WIDTH)
-        
-        # Draw all structures
-        for name, config in STRUCTURES.items():
-            draw_structure(screen, font_large, font_small, name, config)
-        
-        # Draw legend
-        draw_legend(screen, font_legend)
-        
-        # Draw instructions
-        instructions = font_small.render("Press 'S' to save screenshot, 'ESC' to quit", True, (100, 110, 130))
-        screen.blit(instructions, (WINDOW_WIDTH - 350, WINDOW_HEIGHT - 30))
-        
-        # Update display
-        pygame.display.flip()
-        
-        # Cap frame rate
-        clock.tick(60)
+            elif event.key == pygame.K_s:
+                # Save screenshot
+                pygame.image.save(screen, "channel_layout.png")
+                print("Screenshot saved as channel_layout.png")
+        elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+            dirty = True
     
     pygame.quit()
     sys.exit()